@@ -0,0 +1,138 @@
+/*
+ * _obdparse — C fast path for rpm_panel3.parse_first_float.
+ *
+ * Extracts the first float from an OBD response string such as
+ * "1234.5 revolutions_per_minute" or "-3.1 percent" by walking the UTF-8
+ * buffer with a small state machine:
+ *
+ *   sign? -> digits* -> ('.' digits*)? -> (('e'|'E') sign? digits+)?
+ *
+ * (the mantissa needs at least one digit). The matched slice is converted
+ * with PyOS_string_to_double. Anything without a number returns `default`.
+ *
+ * Build in place:  python setup.py build_ext --inplace
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#define IS_DIGIT(c) ((c) >= '0' && (c) <= '9')
+
+/* Length of the number starting at s[0], or 0 if none starts there. */
+static Py_ssize_t
+match_number(const char *s, Py_ssize_t n)
+{
+    Py_ssize_t i = 0, digits = 0;
+
+    if (i < n && (s[i] == '+' || s[i] == '-'))
+        i++;
+    while (i < n && IS_DIGIT(s[i])) {
+        i++;
+        digits++;
+    }
+    if (i < n && s[i] == '.') {
+        i++;
+        while (i < n && IS_DIGIT(s[i])) {
+            i++;
+            digits++;
+        }
+    }
+    if (!digits)
+        return 0;
+
+    /* exponent only counts if at least one digit follows */
+    if (i < n && (s[i] == 'e' || s[i] == 'E')) {
+        Py_ssize_t j = i + 1;
+        if (j < n && (s[j] == '+' || s[j] == '-'))
+            j++;
+        if (j < n && IS_DIGIT(s[j])) {
+            while (j < n && IS_DIGIT(s[j]))
+                j++;
+            i = j;
+        }
+    }
+    return i;
+}
+
+static PyObject *
+parse_first_float(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *kwlist[] = {"value", "default", NULL};
+    PyObject *value, *str;
+    double dflt = 0.0, result;
+    const char *buf;
+    Py_ssize_t n, i, len;
+    char small[64], *tmp;
+    int truth;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|d:parse_first_float",
+                                     kwlist, &value, &dflt))
+        return NULL;
+
+    truth = PyObject_IsTrue(value);
+    if (truth < 0)
+        return NULL;
+    if (!truth)
+        return PyFloat_FromDouble(dflt);
+
+    str = PyObject_Str(value);
+    if (str == NULL)
+        return NULL;
+    buf = PyUnicode_AsUTF8AndSize(str, &n);
+    if (buf == NULL) {
+        Py_DECREF(str);
+        return NULL;
+    }
+
+    for (i = 0; i < n; i++) {
+        char c = buf[i];
+        if (!(IS_DIGIT(c) || c == '.' || c == '+' || c == '-'))
+            continue;
+        len = match_number(buf + i, n - i);
+        if (!len)
+            continue;
+
+        /* NUL-terminated copy so the conversion sees exactly the match */
+        tmp = len < (Py_ssize_t)sizeof(small) ? small : PyMem_Malloc(len + 1);
+        if (tmp == NULL) {
+            Py_DECREF(str);
+            return PyErr_NoMemory();
+        }
+        memcpy(tmp, buf + i, len);
+        tmp[len] = '\0';
+        result = PyOS_string_to_double(tmp, NULL, NULL);
+        if (tmp != small)
+            PyMem_Free(tmp);
+        Py_DECREF(str);
+
+        if (result == -1.0 && PyErr_Occurred()) {
+            PyErr_Clear();
+            return PyFloat_FromDouble(dflt);
+        }
+        return PyFloat_FromDouble(result);
+    }
+
+    Py_DECREF(str);
+    return PyFloat_FromDouble(dflt);
+}
+
+static PyMethodDef obdparse_methods[] = {
+    {"parse_first_float", (PyCFunction)(void (*)(void))parse_first_float,
+     METH_VARARGS | METH_KEYWORDS,
+     "parse_first_float(value, default=0.0)\n--\n\n"
+     "Extract the first float from `value` or return `default`."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef obdparse_module = {
+    PyModuleDef_HEAD_INIT,
+    "_obdparse",
+    "C fast path for parsing numbers out of OBD response strings.",
+    -1,
+    obdparse_methods
+};
+
+PyMODINIT_FUNC
+PyInit__obdparse(void)
+{
+    return PyModule_Create(&obdparse_module);
+}
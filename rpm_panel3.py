@@ -9,18 +9,17 @@ OBD-II real-time dashboard and logger.
 - Trapezoidal integration of total fuel used
 - Heuristic gear estimation
 - Live terminal dashboard (Rich + pyfiglet)
-- Watchdog with auto-restart if FAST data stalls
+- Watchdog with auto-reconnect if FAST data stalls
 - CSV logging with a stable header
 Name 3 becasue i would be have correct version from this what i am using. 
 """
 
 # -----------------------------------------------------------------------------
-#Requires: '''
-numpy==1.26.4
-python-obd==0.7.2
-rich==13.7.1
-pyfiglet==1.0.2
-'''
+# Requires:
+#   numpy==1.26.4
+#   python-obd==0.7.2
+#   rich==13.7.1
+#   pyfiglet==1.0.2
 # -----------------------------------------------------------------------------
 import numpy as np
 if not hasattr(np, "unicode_"):
@@ -33,11 +32,16 @@ if not hasattr(np, "cumproduct"):
 # -----------------------------------------------------------------------------
 import time
 import csv
+import math
 import threading
 import os
 import sys
 import re
+import atexit
+import copy
+import functools
 from datetime import datetime
+from enum import IntEnum
 
 # Third-party
 import obd
@@ -49,6 +53,15 @@ from rich.live import Live
 from rich.layout import Layout
 from pyfiglet import figlet_format
 
+# Optional: Numba JIT for the per-tick fuel math (falls back to plain Python)
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
 ###############################################################################
 # 1) OBD-II & logging settings
 ###############################################################################
@@ -58,7 +71,7 @@ CSV_FILENAME = os.environ.get(
     "CSV_FILENAME",
     f"ecu_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 )
-# Remember the name across restarts (used by watchdog exec)
+# Remember the name for child processes / manual restarts
 os.environ["CSV_FILENAME"] = CSV_FILENAME
 
 ###############################################################################
@@ -89,6 +102,12 @@ commands_slow = [  # ~ every 30 seconds
 ]
 all_commands = commands_fast + commands_medium + commands_slow
 
+# Index of every polled PID in the numeric value array (`_vals`)
+PID = IntEnum("PID", [cmd.name for cmd in all_commands], start=0)
+
+# ELM327 accepts up to 6 mode-01 PIDs in a single request ("01 0C 0D 11 ...")
+MULTI_PID_MAX = 6
+
 ###############################################################################
 # 3) Globals
 ###############################################################################
@@ -100,35 +119,96 @@ if not connection.is_connected():
     sys.exit(1)
 console.print("[bold green]✅ Connected to ECU[/bold green]")
 
+# Live values are double-buffered: the OBD thread owns `_pending` and, once per
+# tick, publishes a copy as `_snapshot`. Readers (UI, watchdog) only ever see
+# a complete snapshot that is never mutated after publishing.
 # Pre-fill with placeholders for all known keys
-live_data = {cmd.name: "..." for cmd in all_commands}
+_pending = {cmd.name: "..." for cmd in all_commands}
 
 # Stable header + our computed fields
-live_data.update({
+_pending.update({
     "FUEL_USAGE_ML_MIN": "-",
     "FUEL_USED_TOTAL_ML": "0.0",          # base (MAF) – trapezoidal integration
     "REAL_FUEL_USAGE_ML_MIN": "-",
     "REAL_FUEL_USED_TOTAL_ML": "0.0",     # trim-corrected – trapezoidal integration
 })
+# Numeric value of every PID (NaN = no data), written straight from the
+# response magnitude; published alongside the strings
+_vals = np.full(len(PID), np.nan, dtype=np.float64)
+# Unit name per command, formatted on first response (see response_text)
+_unit_text = {}
+_snapshot = dict(_pending)
+_snapshot_vals = _vals.copy()
+_snapshot_version = 0  # bumped on every publish; renderers skip unchanged data
+_data_lock = threading.Lock()
 
 csv_header_written = False
-csv_field_order = []  # frozen at first write to keep a stable CSV header
+csv_field_order = tuple(_pending)  # frozen to keep a stable CSV header
+
+# CSV row kept up to date by index as values change: timestamp + fields + gear
+_key_to_idx = {k: i for i, k in enumerate(csv_field_order)}
+_row_buf = ["", *(_pending[k] for k in csv_field_order), ""]
 
 # Totals (ml) – trapezoidal integration
 fuel_used_total_ml = 0.0           # base (MAF only)
 real_fuel_used_total_ml = 0.0      # corrected (MAF * trims)
 
-# Last flow values (ml/min) for the trapezoidal rule
-_last_base_ml_min = None
-_last_real_ml_min = None
-
-# Loop timing
-_last_loop_ts = time.time()
+# Flow samples (ml/min) of the current segment for the trapezoidal rule.
+# Every FUEL_FOLD_INTERVAL_S they are integrated in one vectorized pass and
+# folded into the totals above; the last sample carries over to the next batch.
+FUEL_BUF_SIZE = 4096
+FUEL_FOLD_INTERVAL_S = 10.0
+_buf_ts = np.empty(FUEL_BUF_SIZE, dtype=np.float64)
+_buf_base = np.empty(FUEL_BUF_SIZE, dtype=np.float64)
+_buf_real = np.empty(FUEL_BUF_SIZE, dtype=np.float64)
+_buf_n = 0
+_last_fold_ts = time.time()
+
+# OBD reader thread: CPU it is pinned to and its SCHED_FIFO priority
+# (Linux only; needs root / CAP_SYS_NICE for the priority — skipped otherwise)
+OBD_THREAD_CPU = 1
+OBD_THREAD_PRIORITY = 10
+OBD_LOOP_PERIOD_S = 1.0
+
+# CSV log: opened once and kept for the whole session, flushed periodically
+CSV_FLUSH_INTERVAL_S = 30.0
+_csv_file = open(CSV_FILENAME, mode="a", newline="", buffering=1 << 16)
+_csv_writer = csv.writer(_csv_file)
+_last_csv_flush_ts = time.time()
+atexit.register(_csv_file.close)
 
 # If the loop sleeps too long (e.g., system sleep), skip that "gap"
 MAX_TRAPZ_DT_S = 5.0
 
-# Regex to extract the first float from a string
+# CSV timestamp cache: wall-clock seconds are formatted once per second
+_last_ts_sec = -1
+_last_ts_iso = ""
+
+# Cleared if the adapter/ECU does not answer multi-PID requests
+_multi_pid_ok = True
+# Response-count suffix per multi-PID request, learned from its first reply
+_batch_frame_counts = {}
+
+# Held while querying the ECU and while the watchdog swaps `connection`
+_conn_lock = threading.Lock()
+# Set by the watchdog after a reconnect; the OBD loop then starts a new
+# integration segment instead of bridging the outage
+_reset_fuel_segment = False
+
+# Gear by ceil(RPM/SPEED): (25,35] → 5, (35,45] → 4, (45,60] → 3, (60,90] → 2, (90,130] → 1
+_GEAR_LUT = "?" * 26 + "5" * 10 + "4" * 10 + "3" * 15 + "2" * 30 + "1" * 40
+
+# Byte lookup table for the float scanner in parse_first_float:
+# 1 = may start a number (digits, sign, dot), 2 = exponent only (e/E)
+_IS_NUMCHAR = bytearray(256)
+for _b in b"0123456789.+-":
+    _IS_NUMCHAR[_b] = 1
+for _b in b"eE":
+    _IS_NUMCHAR[_b] = 2
+_IS_NUMCHAR = bytes(_IS_NUMCHAR)
+del _b
+
+# Regex to extract the first float from a string (fallback for odd inputs)
 RX_NUM = re.compile(r"([-+]?\d*\.?\d+)")
 
 ###############################################################################
@@ -139,6 +219,20 @@ def parse_first_float(value: str, default: float = 0.0) -> float:
     if not value or value == "No data" or value == "...":
         return default
     s = str(value)
+    # fast path: table-driven scan for the first numeric run, e.g. "1234.5 rpm"
+    buf = s.encode()
+    n = len(buf)
+    i = 0
+    while i < n and _IS_NUMCHAR[buf[i]] != 1:
+        i += 1
+    j = i
+    while j < n and _IS_NUMCHAR[buf[j]]:
+        j += 1
+    if j > i:
+        try:
+            return float(buf[i:j])
+        except ValueError:
+            pass  # e.g. "-" or "1.2.3" — let the regex sort it out
     m = RX_NUM.search(s)
     if m:
         try:
@@ -147,6 +241,105 @@ def parse_first_float(value: str, default: float = 0.0) -> float:
             return default
     return default
 
+# Optional C implementation (build with `python setup.py build_ext --inplace`)
+try:
+    from _obdparse import parse_first_float
+except ImportError:
+    pass
+
+def group_multi_pid(commands: list) -> list:
+    """Split commands into multi-PID request groups (mode 01, max 6 each).
+
+    Non mode-01 commands get a group of their own and are queried one by one.
+    """
+    mode01 = [cmd for cmd in commands if cmd.mode == 1]
+    groups = [mode01[i:i + MULTI_PID_MAX] for i in range(0, len(mode01), MULTI_PID_MAX)]
+    groups += [[cmd] for cmd in commands if cmd.mode != 1]
+    return groups
+
+def forget_last_command(conn) -> None:
+    """Clear python-OBD's last-command memory after sending behind its back.
+
+    In fast mode `OBD.query` sends a bare CR ("repeat last command") when a
+    query matches the last command *it* sent; after a raw send that would
+    repeat our request instead.
+    """
+    conn._OBD__last_command = b""
+
+def send_raw(raw: bytes) -> list:
+    """Send a raw request to the ELM327 behind `OBD.query`'s back."""
+    messages = connection.interface.send_and_parse(raw) or []
+    forget_last_command(connection)
+    return messages
+
+def query_multi_pid(cmds: list) -> dict:
+    """Query several mode-01 PIDs in one ELM327 round trip.
+
+    Returns {cmd.name: OBDResponse} for the PIDs found in the reply; PIDs the
+    ECU left out are simply missing from the result.
+    """
+    by_pid = {cmd.pid: cmd for cmd in cmds}
+    raw = b"01" + b"".join(cmd.command[2:] for cmd in cmds)
+    # like OBD.query in fast mode: append the known frame count so the ELM327
+    # returns early instead of waiting out its timeout
+    count = _batch_frame_counts.get(raw)
+    messages = send_raw(raw if count is None else raw + count)
+    if count is None and messages and connection.fast:
+        _batch_frame_counts[raw] = str(sum(len(m.frames) for m in messages)).encode()
+
+    responses = {}
+    for msg in messages:
+        data = msg.data
+        if len(data) < 2 or data[0] != 0x41:
+            continue
+        # reply layout: 41 <pid> <data...> <pid> <data...> ...
+        i = 1
+        while i < len(data):
+            cmd = by_pid.get(data[i])
+            if cmd is None:
+                break  # padding or unknown PID — cannot find the next boundary
+            n = cmd.bytes - 2
+            part = copy.copy(msg)
+            part.data = bytearray([0x41, data[i]]) + data[i + 1:i + 1 + n]
+            i += 1 + n
+            response = cmd([part])  # decoder also filters by ECU
+            if not response.is_null():
+                responses.setdefault(cmd.name, response)
+    return responses
+
+def build_fast_queries() -> dict:
+    """Per-command query closures for the supported FAST PIDs.
+
+    Each closure sends the pre-resolved command bytes on the pre-resolved
+    interface and runs the command's decoder directly, skipping `OBD.query`'s
+    status / support checks. Like `OBD.query` in fast mode, the frame count of
+    the first reply is appended to the request ("010C1") so the ELM327 returns
+    as soon as it has that many frames instead of waiting out its timeout.
+    Rebuilt on every (re)connect, since interface and supported PIDs belong to
+    the connection.
+    """
+    conn = connection
+    if conn.interface is None:
+        return {}
+    send = conn.interface.send_and_parse
+
+    def make(cmd):
+        raw = cmd.command
+        count_pending = conn.fast and cmd.fast
+
+        def query():
+            nonlocal raw, count_pending
+            messages = send(raw) or []
+            forget_last_command(conn)
+            if count_pending and messages:
+                raw += str(sum(len(m.frames) for m in messages)).encode()
+                count_pending = False
+            return cmd(messages)
+        return query
+
+    return {cmd: make(cmd) for cmd in commands_fast if conn.supports(cmd)}
+
+@njit("float64(float64)", cache=True, fastmath=True)
 def calculate_fuel_usage_maf(maf_g_s: float) -> float:
     """Convert MAF [g/s] to fuel usage [ml/min] assuming stoichiometric AFR."""
     AFR = 14.7           # gasoline stoichiometric air–fuel ratio
@@ -155,84 +348,228 @@ def calculate_fuel_usage_maf(maf_g_s: float) -> float:
     fuel_ml_s = fuel_g_s / FUEL_DENSITY
     return fuel_ml_s * 60.0  # ml/min
 
+@njit("float64(float64, float64, float64)", cache=True, fastmath=True)
 def calculate_real_fuel_usage(maf_g_s: float, stft_pp: float, ltft_pp: float) -> float:
     """Trim-corrected fuel usage [ml/min]."""
     base_ml_min = calculate_fuel_usage_maf(maf_g_s)
     factor = (1.0 + ltft_pp / 100.0) * (1.0 + stft_pp / 100.0)
     return base_ml_min * factor
 
+@njit("float64(float64[:], float64[:])", cache=True, fastmath=True)
+def trapz_ml(ts_s: np.ndarray, flow_ml_min: np.ndarray) -> float:
+    """Trapezoidal integral of a flow [ml/min] sampled at `ts_s` [s] → [ml]."""
+    if ts_s.size < 2:
+        return 0.0
+    return np.sum((ts_s[1:] - ts_s[:-1]) * (flow_ml_min[1:] + flow_ml_min[:-1])) / 120.0
+
+def iso_timestamp(now: float) -> str:
+    """Local ISO-8601 timestamp with microseconds for `now` (time.time())."""
+    global _last_ts_sec, _last_ts_iso
+    # round to the microsecond like datetime.fromtimestamp (carry into seconds)
+    frac, whole = math.modf(now)
+    us = round(frac * 1e6)
+    sec = int(whole)
+    if us >= 1000000:
+        sec += 1
+        us -= 1000000
+    if sec != _last_ts_sec:
+        _last_ts_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        _last_ts_sec = sec
+    return f"{_last_ts_iso}.{us:06d}"
+
+@functools.lru_cache(maxsize=1024)
+def figlet(text: str, font: str) -> str:
+    """Cached `figlet_format` — pure function of (text, font)."""
+    return figlet_format(text, font=font)
+
 def calculate_gear(rpm: int, speed: int) -> str:
     """Heuristic gear estimate based on RPM/Speed ratio."""
     if speed < 2 or rpm < 600:
         return "N"
-    ratio = rpm / (speed or 1)
-    if 130 >= ratio > 90:
-        return "1"
-    elif 90 >= ratio > 60:
-        return "2"
-    elif 60 >= ratio > 45:
-        return "3"
-    elif 45 >= ratio > 35:
-        return "4"
-    elif 35 >= ratio > 25:
-        return "5"
-    else:
-        return "?"
+    # ceil(rpm / speed) keeps the (low, high] ratio bands exact
+    ratio = -(-rpm // speed)
+    return _GEAR_LUT[ratio] if ratio < len(_GEAR_LUT) else "?"
+
+# FAST group split into multi-PID requests once, reused every tick
+_fast_groups = group_multi_pid(commands_fast)
+# Direct send+decode path per supported FAST command (see build_fast_queries)
+_fast_queries = build_fast_queries()
 
 ###############################################################################
 # 5) OBD read loop (trapezoidal integration)
 ###############################################################################
-def read_obd_loop():
-    global csv_header_written, csv_field_order
-    global fuel_used_total_ml, real_fuel_used_total_ml
-    global _last_loop_ts, _last_base_ml_min, _last_real_ml_min
+def publish_snapshot() -> None:
+    """Publish copies of the OBD thread's `_pending` / `_vals` as the new snapshot."""
+    global _snapshot, _snapshot_vals, _snapshot_version
+    snap = dict(_pending)
+    snap_vals = _vals.copy()
+    with _data_lock:
+        _snapshot = snap
+        _snapshot_vals = snap_vals
+        _snapshot_version += 1
+
+def set_live(key: str, value: str) -> None:
+    """Set a live value in `_pending` and in the prebuilt CSV row."""
+    _pending[key] = value
+    _row_buf[_key_to_idx[key] + 1] = value
+
+def get_snapshot() -> tuple:
+    """Return (version, strings, values) of the latest published live data."""
+    with _data_lock:
+        return _snapshot_version, _snapshot, _snapshot_vals
+
+def pid_value(vals: np.ndarray, pid: PID, default: float = 0.0) -> float:
+    """Numeric value of `pid` from a value array, or `default` if there is none."""
+    v = vals[pid]
+    return default if v != v else float(v)  # NaN check
+
+def response_text(cmd, response) -> str:
+    """Display/CSV text of `response`; also stores its numeric value in `_vals`.
+
+    Pint quantities are not formatted via `str()` — the text is rebuilt from
+    the raw magnitude and the unit name, which is formatted once per command.
+    """
+    pid = PID[cmd.name]
+    if response.is_null():
+        _vals[pid] = np.nan
+        return "No data"
+    value = response.value
+    magnitude = getattr(value, "magnitude", None)
+    if magnitude is None:
+        # not a Pint quantity (status bits, strings, ...) — keep the old path
+        text = str(value)
+        _vals[pid] = parse_first_float(text, np.nan)
+        return text
+    try:
+        _vals[pid] = float(magnitude)
+    except (TypeError, ValueError):
+        _vals[pid] = np.nan
+    unit = _unit_text.get(cmd.name)
+    if unit is None:
+        unit = _unit_text[cmd.name] = str(value.units)
+    return f"{magnitude} {unit}"  # same text as str(Quantity)
+
+def tune_io_thread() -> None:
+    """Pin the calling thread to OBD_THREAD_CPU and raise it to SCHED_FIFO.
+
+    Keeps the serial polling cadence steady under load so the watchdog is not
+    tripped by scheduler jitter. Every step is best effort.
+    """
+    try:
+        if OBD_THREAD_CPU in os.sched_getaffinity(0):
+            os.sched_setaffinity(0, {OBD_THREAD_CPU})
+    except (AttributeError, OSError):
+        pass  # not Linux, or the CPU is not available to us
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(OBD_THREAD_PRIORITY))
+    except (AttributeError, OSError):
+        pass  # not Linux, or not permitted (non-root)
+
+def fold_fuel_buffer(keep_last: bool) -> None:
+    """Integrate the buffered flow samples into the totals and empty the buffer.
+
+    With `keep_last`, the newest sample stays as the start of the next batch so
+    no trapezoid is lost; without it a new segment starts (gap / bad sample).
+    """
+    global fuel_used_total_ml, real_fuel_used_total_ml, _buf_n
+    n = _buf_n
+    if n >= 2:
+        fuel_used_total_ml += trapz_ml(_buf_ts[:n], _buf_base[:n])
+        real_fuel_used_total_ml += trapz_ml(_buf_ts[:n], _buf_real[:n])
+    if keep_last and n:
+        _buf_ts[0] = _buf_ts[n - 1]
+        _buf_base[0] = _buf_base[n - 1]
+        _buf_real[0] = _buf_real[n - 1]
+        _buf_n = 1
+    else:
+        _buf_n = 0
 
-    sec_count = 0
+def poll_commands(sec_count: int) -> dict:
+    """Query the FAST group, plus MEDIUM / SLOW when due; returns {name: value}."""
+    global _multi_pid_ok
 
-    while True:
-        now = time.time()
-        dt_s = max(0.0, now - _last_loop_ts)   # delta time [s]
-        _last_loop_ts = now
+    row = {}
 
-        sec_count += 1
-        row = {}
+    # ---------- FAST ----------
+    for group in _fast_groups:
+        batch = {}
+        batched = _multi_pid_ok and len(group) > 1
+        if batched:
+            try:
+                batch = query_multi_pid(group)
+            except Exception:
+                batch = {}
+        single_ok = False
+        for cmd in group:
+            try:
+                response = batch.get(cmd.name)
+                if response is None:
+                    query = _fast_queries.get(cmd)
+                    response = query() if query is not None else connection.query(cmd)
+                    single_ok = single_ok or not response.is_null()
+                value = response_text(cmd, response)
+            except Exception as e:
+                _vals[PID[cmd.name]] = np.nan
+                value = f"error: {e}"
+            row[cmd.name] = value
+        if batched and not batch and single_ok:
+            # ECU answers single PIDs but not multi-PID — stop batching
+            _multi_pid_ok = False
+
+    # ---------- MEDIUM ----------
+    if sec_count % 15 == 0:
+        for cmd in commands_medium:
+            try:
+                response = connection.query(cmd)
+                value = response_text(cmd, response)
+            except Exception as e:
+                _vals[PID[cmd.name]] = np.nan
+                value = f"error: {e}"
+            row[cmd.name] = value
 
-        # ---------- FAST ----------
-        for cmd in commands_fast:
+    # ---------- SLOW ----------
+    if sec_count % 30 == 0:
+        for cmd in commands_slow:
             try:
                 response = connection.query(cmd)
-                value = str(response.value) if not response.is_null() else "No data"
+                value = response_text(cmd, response)
             except Exception as e:
+                _vals[PID[cmd.name]] = np.nan
                 value = f"error: {e}"
             row[cmd.name] = value
 
-        # ---------- MEDIUM ----------
-        if sec_count % 15 == 0:
-            for cmd in commands_medium:
-                try:
-                    response = connection.query(cmd)
-                    value = str(response.value) if not response.is_null() else "No data"
-                except Exception as e:
-                    value = f"error: {e}"
-                row[cmd.name] = value
-
-        # ---------- SLOW ----------
-        if sec_count % 30 == 0:
-            for cmd in commands_slow:
-                try:
-                    response = connection.query(cmd)
-                    value = str(response.value) if not response.is_null() else "No data"
-                except Exception as e:
-                    value = f"error: {e}"
-                row[cmd.name] = value
+    return row
+
+def read_obd_loop():
+    global csv_header_written
+    global _buf_n, _last_fold_ts, _reset_fuel_segment
+    global _last_csv_flush_ts
+
+    tune_io_thread()
+
+    sec_count = 0
+    deadline = time.monotonic()
+
+    while True:
+        now = time.time()
+
+        sec_count += 1
+
+        with _conn_lock:
+            row = poll_commands(sec_count)
+            if _reset_fuel_segment:
+                # fresh connection → don't integrate across the reconnect
+                _reset_fuel_segment = False
+                fold_fuel_buffer(keep_last=False)
 
         # ---------- Update live data ----------
-        live_data.update(row)
+        for key, value in row.items():
+            set_live(key, value)
 
         # ---------- Fuel calculations + trapezoidal integration ----------
-        maf_g_s = parse_first_float(live_data.get("MAF"), default=0.0)
-        stft_pp = parse_first_float(live_data.get("SHORT_FUEL_TRIM_1"), default=0.0)
-        ltft_pp = parse_first_float(live_data.get("LONG_FUEL_TRIM_1"), default=0.0)
+        maf_g_s = pid_value(_vals, PID.MAF)
+        stft_pp = pid_value(_vals, PID.SHORT_FUEL_TRIM_1)
+        ltft_pp = pid_value(_vals, PID.LONG_FUEL_TRIM_1)
 
         # current flow rates [ml/min]
         if maf_g_s > 0.0:
@@ -241,121 +578,185 @@ def read_obd_loop():
                 real_ml_min = calculate_real_fuel_usage(maf_g_s, stft_pp, ltft_pp)
 
                 # update live instantaneous values
-                live_data["FUEL_USAGE_ML_MIN"] = f"{base_ml_min:.1f}"
-                live_data["REAL_FUEL_USAGE_ML_MIN"] = f"{real_ml_min:.1f}"
-
-                # trapezoidal integration if we have previous points and a sane dt
-                if (
-                    _last_base_ml_min is not None
-                    and _last_real_ml_min is not None
-                    and 0.0 < dt_s <= MAX_TRAPZ_DT_S
-                ):
-                    dt_min = dt_s / 60.0
-                    # base
-                    fuel_used_total_ml += 0.5 * (_last_base_ml_min + base_ml_min) * dt_min
-                    # real (trim-corrected)
-                    real_fuel_used_total_ml += 0.5 * (_last_real_ml_min + real_ml_min) * dt_min
-                # otherwise: first point or a gap — just set the baselines
-
-                # set previous values for the next trapezoid
-                _last_base_ml_min = base_ml_min
-                _last_real_ml_min = real_ml_min
-
-                # update total counters
-                live_data["FUEL_USED_TOTAL_ML"] = f"{fuel_used_total_ml:.1f}"
-                live_data["REAL_FUEL_USED_TOTAL_ML"] = f"{real_fuel_used_total_ml:.1f}"
+                set_live("FUEL_USAGE_ML_MIN", f"{base_ml_min:.1f}")
+                set_live("REAL_FUEL_USAGE_ML_MIN", f"{real_ml_min:.1f}")
+
+                # a gap since the previous sample → close the segment, start a new one
+                if _buf_n and not (0.0 < now - _buf_ts[_buf_n - 1] <= MAX_TRAPZ_DT_S):
+                    fold_fuel_buffer(keep_last=False)
+
+                _buf_ts[_buf_n] = now
+                _buf_base[_buf_n] = base_ml_min
+                _buf_real[_buf_n] = real_ml_min
+                _buf_n += 1
+
+                if _buf_n == FUEL_BUF_SIZE or now - _last_fold_ts >= FUEL_FOLD_INTERVAL_S:
+                    fold_fuel_buffer(keep_last=True)
+                    _last_fold_ts = now
+
+                # update total counters (folded totals + the pending batch)
+                base_total = fuel_used_total_ml + trapz_ml(_buf_ts[:_buf_n], _buf_base[:_buf_n])
+                real_total = real_fuel_used_total_ml + trapz_ml(_buf_ts[:_buf_n], _buf_real[:_buf_n])
+                set_live("FUEL_USED_TOTAL_ML", f"{base_total:.1f}")
+                set_live("REAL_FUEL_USED_TOTAL_ML", f"{real_total:.1f}")
 
             except Exception:
-                live_data["FUEL_USAGE_ML_MIN"] = "MAF error"
-                live_data["REAL_FUEL_USAGE_ML_MIN"] = "calc error"
-                # reset to avoid integrating through a bad sample
-                _last_base_ml_min = None
-                _last_real_ml_min = None
+                set_live("FUEL_USAGE_ML_MIN", "MAF error")
+                set_live("REAL_FUEL_USAGE_ML_MIN", "calc error")
+                # close the segment to avoid integrating through a bad sample
+                fold_fuel_buffer(keep_last=False)
         else:
-            # no MAF → do not integrate; reset previous sample
-            live_data["FUEL_USAGE_ML_MIN"] = "-"
-            live_data["REAL_FUEL_USAGE_ML_MIN"] = "-"
-            _last_base_ml_min = None
-            _last_real_ml_min = None
+            # no MAF → no sample this tick; the next one bridges a short gap
+            # (up to MAX_TRAPZ_DT_S) instead of restarting the segment
+            set_live("FUEL_USAGE_ML_MIN", "-")
+            set_live("REAL_FUEL_USAGE_ML_MIN", "-")
 
         # ---------- CSV write ----------
         try:
-            with open(CSV_FILENAME, mode="a", newline="") as file:
-                writer = csv.writer(file)
-                if not csv_header_written:
-                    csv_field_order = list(live_data.keys())
-                    header = ["timestamp"] + csv_field_order + ["GEAR"]
-                    writer.writerow(header)
-                    csv_header_written = True
-
-                rpm = int(parse_first_float(live_data.get("RPM"), default=0.0))
-                speed = int(parse_first_float(live_data.get("SPEED"), default=0.0))
-                gear = calculate_gear(rpm, speed)
-
-                row_csv = [datetime.now().isoformat()] + [live_data[k] for k in csv_field_order] + [gear]
-                writer.writerow(row_csv)
+            if not csv_header_written:
+                header = ["timestamp", *csv_field_order, "GEAR"]
+                _csv_writer.writerow(header)
+                csv_header_written = True
+
+            rpm = int(pid_value(_vals, PID.RPM))
+            speed = int(pid_value(_vals, PID.SPEED))
+            gear = calculate_gear(rpm, speed)
+
+            _row_buf[0] = iso_timestamp(now)
+            _row_buf[-1] = gear
+            _csv_writer.writerow(_row_buf)
+
+            # flush every CSV_FLUSH_INTERVAL_S instead of on every row
+            if now - _last_csv_flush_ts >= CSV_FLUSH_INTERVAL_S:
+                _csv_file.flush()
+                _last_csv_flush_ts = now
         except Exception as e:
             console.log(f"[red]❌ CSV write error:[/red] {e}")
 
-        time.sleep(1)
+        publish_snapshot()
+
+        # fixed-rate ticks: sleep until the next deadline instead of a flat 1 s
+        deadline += OBD_LOOP_PERIOD_S
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            deadline = time.monotonic()  # overran the period — don't burst to catch up
 
 ###############################################################################
-# 6) Watchdog – restart if FAST data stalled
+# 6) Watchdog – reconnect if FAST data stalled
 ###############################################################################
+def reconnect() -> bool:
+    """Close the ECU link and open a new one in place.
+
+    Fuel totals, the CSV file and the UI survive; only the integration
+    segment is restarted. Returns True if the new connection is up.
+    """
+    global connection, _fast_queries, _multi_pid_ok, _reset_fuel_segment
+    with _conn_lock:
+        try:
+            connection.close()
+        except Exception:
+            pass
+        connection = obd.OBD(PORT, timeout=TIMEOUT)
+        _fast_queries = build_fast_queries() if connection.is_connected() else {}
+        _multi_pid_ok = True  # re-probe multi-PID support on the new link
+        _batch_frame_counts.clear()
+        _reset_fuel_segment = True
+        return connection.is_connected()
+
 def watchdog_loop():
     last_fast_seen = time.time()
     while True:
         # monitor FAST group by checking MAF
-        maf_val = parse_first_float(live_data.get("MAF"), default=0.0)
+        _, _, vals = get_snapshot()
+        maf_val = pid_value(vals, PID.MAF)
         if maf_val > 0.0:
             last_fast_seen = time.time()
-        # if no FAST data for >5 s → hard restart the process
+        # if no FAST data for >5 s → reconnect to the ECU in place
         if time.time() - last_fast_seen > 5:
-            console.log("[bold red]⚠️ No FAST data — restarting app![/bold red]")
-            time.sleep(1)
-            os.execvpe(sys.executable, [sys.executable] + sys.argv, os.environ)
+            console.log("[bold red]⚠️ No FAST data — reconnecting to ECU![/bold red]")
+            try:
+                ok = reconnect()
+            except Exception as e:
+                console.log(f"[red]❌ Reconnect error:[/red] {e}")
+                ok = False
+            if ok:
+                console.log("[bold green]✅ Reconnected to ECU[/bold green]")
+            # give the (new) link another full window before the next attempt
+            last_fast_seen = time.time()
         time.sleep(1)
 
 ###############################################################################
 # 7) Panels rendering
 ###############################################################################
+# Panels are built once; each refresh only rewrites their text / cells.
+_rpm_text = Text("", style="bold cyan")
+_speed_text = Text("", style="bold green")
+_info_lines = [
+    Text("", style="bold"),            # RPM
+    Text("", style="bold"),            # SPEED
+    Text("", style="bold yellow"),     # GEAR
+    Text("", style="bold magenta"),    # FUEL (base)
+    Text("", style="bold magenta"),    # FUEL (real)
+    Text("", style="bold"),            # Σ base
+    Text("", style="bold"),            # Σ real
+]
+_LEFT_PANEL = Panel(
+    Group(Text("SPEED", style="bold underline", justify="center"), _speed_text, _rpm_text, *_info_lines),
+    title="Opel Corsa D 1.2",
+    border_style="cyan",
+)
+
+_ECU_TABLE = Table(title="🧠 ECU Live Data", show_header=True, expand=True)
+_ECU_TABLE.add_column("Parameter", style="bold cyan")
+_ECU_TABLE.add_column("Value", style="bold green")
+for _key, _value in _snapshot.items():
+    _ECU_TABLE.add_row(_key, str(_value))
+del _key, _value
+_ECU_ROW_IDX = {key: i for i, key in enumerate(_snapshot)}
+_ECU_VALUE_CELLS = _ECU_TABLE.columns[1]._cells
+_ECU_PANEL = Panel(_ECU_TABLE, border_style="magenta")
+
+# Snapshot version each panel was last rendered from
+_left_version = -1
+_ecu_version = -1
+
 def render_left_panel():
-    try:
-        rpm = int(parse_first_float(live_data.get("RPM"), default=0.0))
-    except ValueError:
-        rpm = 0
-    try:
-        speed = int(parse_first_float(live_data.get("SPEED"), default=0.0))
-    except ValueError:
-        speed = 0
+    global _left_version
+    version, data, vals = get_snapshot()
+    if version == _left_version:
+        return _LEFT_PANEL
+    _left_version = version
 
-    gear = calculate_gear(rpm, speed)
+    rpm = int(pid_value(vals, PID.RPM))
+    speed = int(pid_value(vals, PID.SPEED))
 
-    rpm_text_big = figlet_format(str(rpm), font="digital")
-    rpm_text = Text(rpm_text_big, style="bold cyan")
+    gear = calculate_gear(rpm, speed)
 
-    speed_text_big = figlet_format(str(speed), font="big")
-    speed_text = Text(speed_text_big, style="bold green")
+    _rpm_text.plain = figlet(str(rpm), "digital")
+    _speed_text.plain = figlet(str(speed), "big")
 
-    info = Text()
-    info.append(f"RPM:   {rpm}\n", style="bold")
-    info.append(f"SPEED: {speed} km/h\n", style="bold")
-    info.append(f"GEAR:  {gear}\n", style="bold yellow")
-    info.append(f"FUEL (base): {live_data.get('FUEL_USAGE_ML_MIN', '-') } ml/min\n", style="bold magenta")
-    info.append(f"FUEL (real): {live_data.get('REAL_FUEL_USAGE_ML_MIN', '-') } ml/min\n", style="bold magenta")
-    info.append(f"Σ base: {live_data.get('FUEL_USED_TOTAL_ML','0')} ml (trapz)\n", style="bold")
-    info.append(f"Σ real: {live_data.get('REAL_FUEL_USED_TOTAL_ML','0')} ml (trapz)\n", style="bold")
+    _info_lines[0].plain = f"RPM:   {rpm}"
+    _info_lines[1].plain = f"SPEED: {speed} km/h"
+    _info_lines[2].plain = f"GEAR:  {gear}"
+    _info_lines[3].plain = f"FUEL (base): {data.get('FUEL_USAGE_ML_MIN', '-') } ml/min"
+    _info_lines[4].plain = f"FUEL (real): {data.get('REAL_FUEL_USAGE_ML_MIN', '-') } ml/min"
+    _info_lines[5].plain = f"Σ base: {data.get('FUEL_USED_TOTAL_ML','0')} ml (trapz)"
+    _info_lines[6].plain = f"Σ real: {data.get('REAL_FUEL_USED_TOTAL_ML','0')} ml (trapz)"
 
-    group = Group(Text("SPEED", style="bold underline", justify="center"), speed_text, rpm_text, info)
-    return Panel(group, title="Opel Corsa D 1.2", border_style="cyan")
+    return _LEFT_PANEL
 
 def render_ecu_panel():
-    table = Table(title="🧠 ECU Live Data", show_header=True, expand=True)
-    table.add_column("Parameter", style="bold cyan")
-    table.add_column("Value", style="bold green")
-    for key, value in live_data.items():
-        table.add_row(key, str(value))
-    return Panel(table, border_style="magenta")
+    global _ecu_version
+    version, data, _ = get_snapshot()
+    if version == _ecu_version:
+        return _ECU_PANEL
+    _ecu_version = version
+
+    for key, value in data.items():
+        _ECU_VALUE_CELLS[_ECU_ROW_IDX[key]] = str(value)
+    return _ECU_PANEL
 
 ###############################################################################
 # 8) Main UI loop
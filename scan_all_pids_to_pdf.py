@@ -9,7 +9,8 @@ OBD-II PID scanner → PDF report.
 - Queries supported PIDs once
 - Generates a PDF report with a table
 
-Requires: python-obd, fpdf2, rich (optional, for nicer logs)
+Requires: python-obd, fpdf2 (>= 2.8 for the fast table writer; older
+versions fall back to per-cell output), rich (optional, for nicer logs)
 """
 
 import sys
@@ -34,13 +35,10 @@ def collect_all_commands() -> list[OBDCommand]:
     """
     Collect all OBDCommand objects defined in python-OBD.
     """
-    cmds = []
-    for name in dir(obd.commands):
-        attr = getattr(obd.commands, name)
-        if isinstance(attr, OBDCommand):
-            cmds.append(attr)
-    # Sort by mode and PID for nicer output
-    cmds.sort(key=lambda c: (c.mode, c.command))
+    # commands are stored by name in the instance dict of obd.commands
+    cmds = [c for c in vars(obd.commands).values() if isinstance(c, OBDCommand)]
+    # Sort by mode and PID for nicer output (ELM AT commands have no mode → first)
+    cmds.sort(key=lambda c: (c.mode if c.mode is not None else -1, c.command))
     return cmds
 
 
@@ -63,6 +61,54 @@ class PIDReportPDF(FPDF):
             self.cell(w, 6, h, border=1, align="C", fill=True)
         self.ln()
 
+    def write_row(self, values: list[str], widths: list[float], aligns: list[str], h: float = 5):
+        """
+        Write one bordered table row with a single content-stream write.
+
+        Renders like one `cell(w, h, text, border=1, align=...)` per column,
+        but all rectangles and text runs are serialized together and passed
+        to `_out` once. Only meant for core fonts (the report uses Helvetica).
+        Relies on fpdf2 >= 2.8 internals; older versions get plain `cell()` calls.
+        """
+        if not self._can_write_raw_rows():
+            for w, text, align in zip(widths, values, aligns):
+                self.cell(w, h, text, border=1, align=align)
+            self.ln()
+            return
+
+        if self.will_page_break(h):
+            self.add_page()
+        if not self.current_font_is_set_on_page:
+            self._out(self._set_font_for_page(self.current_font, self.font_size_pt))
+
+        k = self.k
+        top = (self.h - self.y) * k
+        text_y = (self.h - self.y - 0.5 * h - 0.3 * self.font_size) * k
+        ops = [self.text_color.serialize().lower()]  # text is painted with the fill colour
+        x = self.x
+        for w, text, align in zip(widths, values, aligns):
+            ops.append(f"{x * k:.2f} {top:.2f} {w * k:.2f} {-h * k:.2f} re S")
+            if text:
+                text = self.normalize_text(text)
+                if align == "C":
+                    dx = (w - self.get_string_width(text)) / 2
+                else:
+                    dx = self.c_margin
+                ops.append(f"BT {(x + dx) * k:.2f} {text_y:.2f} Td {self.current_font.encode_text(text)} ET")
+            x += w
+        # q/Q keeps the colour change local to this row
+        self._out(f"q {' '.join(ops)} Q")
+        self.ln(h)
+
+    def _can_write_raw_rows(self) -> bool:
+        """True if this fpdf2 version has the internals `write_row` uses."""
+        return (
+            hasattr(self, "current_font_is_set_on_page")
+            and hasattr(self, "_set_font_for_page")
+            and hasattr(self.current_font, "encode_text")
+            and hasattr(self.text_color, "serialize")
+        )
+
     def footer(self):
         self.set_y(-12)
         self.set_font("Helvetica", "I", 8)
@@ -89,15 +135,17 @@ def main():
     all_cmds = collect_all_commands()
     console.print(f"[bold]Total python-OBD commands found:[/bold] {len(all_cmds)}")
 
+    # python-OBD reads the "PIDs supported" bitmaps (01 00, 01 20, ..., 01 E0,
+    # plus the mode 06/09 ones) while connecting and keeps the result in
+    # `supported_commands`; `connection.supports()` is just a lookup in it.
+    supported = set(connection.supported_commands)
+    console.print(f"[bold]Supported per ECU bitmaps:[/bold] {len(supported)}")
+
     rows = []
     supported_count = 0
 
     for cmd in all_cmds:
-        try:
-            is_supported = connection.supports(cmd)
-        except Exception as e:
-            console.log(f"[red]Error checking support for {cmd.name}: {e}[/red]")
-            is_supported = False
+        is_supported = cmd in supported
 
         value_str = ""
         unit_str = ""
@@ -139,15 +187,21 @@ def main():
     pdf.set_font("Helvetica", "", 8)
 
     col_widths = [15, 18, 40, 20, 70, 20]  # must match header
+    col_aligns = ["L", "L", "L", "C", "L", "L"]
 
     for r in rows:
-        pdf.cell(col_widths[0], 5, str(r["mode"]), border=1)
-        pdf.cell(col_widths[1], 5, str(r["pid"]), border=1)
-        pdf.cell(col_widths[2], 5, truncate(r["name"], 22), border=1)
-        pdf.cell(col_widths[3], 5, r["supported"], border=1, align="C")
-        pdf.cell(col_widths[4], 5, truncate(r["value"], 40), border=1)
-        pdf.cell(col_widths[5], 5, truncate(r["unit"], 10), border=1)
-        pdf.ln()
+        pdf.write_row(
+            [
+                str(r["mode"]),
+                str(r["pid"]),
+                truncate(r["name"], 22),
+                r["supported"],
+                truncate(r["value"], 40),
+                truncate(r["unit"], 10),
+            ],
+            col_widths,
+            col_aligns,
+        )
 
     try:
         pdf.output(PDF_FILENAME)
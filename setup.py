@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Optional C extension for rpm_panel3.py.
+
+Build in place next to the scripts:
+
+    python setup.py build_ext --inplace
+
+Without it, rpm_panel3.py uses its pure-Python parser.
+"""
+
+from setuptools import setup, Extension
+
+setup(
+    name="obd2-live-panel-ext",
+    ext_modules=[Extension("_obdparse", sources=["_obdparse.c"])],
+)